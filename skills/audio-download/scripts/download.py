@@ -5,56 +5,86 @@ Supports YouTube and Twitter/X URLs.
 """
 
 import argparse
+import hashlib
 import os
 import re
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
+# Shared yt-dlp cache (player JS, signature functions) reused across runs
+YTDLP_CACHE_DIR = Path.home() / ".cache" / "yt-dlp"
 
-def validate_url(url: str) -> bool:
-    """Check if URL is a supported platform (YouTube or Twitter/X)."""
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-
-    # YouTube domains
-    youtube_domains = [
-        "youtube.com",
-        "www.youtube.com",
-        "youtu.be",
-        "m.youtube.com",
-        "music.youtube.com",
-    ]
+# Extracted metadata for single videos, so repeat runs skip extraction.
+# YouTube stream URLs inside the metadata expire after ~6 hours.
+META_CACHE_DIR = Path.home() / ".cache" / "sancho-ytdlp-meta"
+META_CACHE_TTL = 5 * 3600
 
-    # Twitter/X domains
-    twitter_domains = [
-        "twitter.com",
-        "www.twitter.com",
-        "x.com",
-        "www.x.com",
-        "mobile.twitter.com",
-        "mobile.x.com",
-    ]
 
-    all_supported = youtube_domains + twitter_domains
-    return any(domain.endswith(d) or domain == d for d in all_supported)
+YOUTUBE_DOMAINS = frozenset({
+    "youtube.com",
+    "www.youtube.com",
+    "youtu.be",
+    "m.youtube.com",
+    "music.youtube.com",
+})
 
+TWITTER_DOMAINS = frozenset({
+    "twitter.com",
+    "www.twitter.com",
+    "x.com",
+    "www.x.com",
+    "mobile.twitter.com",
+    "mobile.x.com",
+})
 
-def get_platform(url: str) -> str:
-    """Identify the platform from URL."""
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
+# str.endswith takes a tuple and checks every suffix in one call
+YOUTUBE_SUFFIXES = tuple(YOUTUBE_DOMAINS)
+TWITTER_SUFFIXES = tuple(TWITTER_DOMAINS)
 
-    youtube_domains = ["youtube.com", "www.youtube.com", "youtu.be", "m.youtube.com"]
-    if any(domain.endswith(d) or domain == d for d in youtube_domains):
+
+def classify_url(url: str) -> str | None:
+    """Identify the platform from URL, or None if it isn't supported."""
+    domain = urlparse(url).netloc.lower()
+
+    if domain in YOUTUBE_DOMAINS or domain.endswith(YOUTUBE_SUFFIXES):
         return "YouTube"
 
-    twitter_domains = ["twitter.com", "www.twitter.com", "x.com", "www.x.com"]
-    if any(domain.endswith(d) or domain == d for d in twitter_domains):
+    if domain in TWITTER_DOMAINS or domain.endswith(TWITTER_SUFFIXES):
         return "Twitter/X"
 
-    return "Unknown"
+    return None
+
+
+def is_single_video_url(url: str) -> bool:
+    """Check if URL points at exactly one video (not a playlist or channel)."""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if "list" in query:
+        return False
+    return (
+        parsed.netloc.lower().endswith("youtu.be")
+        or "v" in query
+        or parsed.path.startswith(("/shorts/", "/live/"))
+        or "/status/" in parsed.path
+    )
+
+
+def get_info_json_path(url: str) -> Path:
+    """Path of the cached yt-dlp metadata for a URL."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return META_CACHE_DIR / f"{key}.info.json"
+
+
+def is_info_json_fresh(info_json: Path) -> bool:
+    """Check if cached metadata exists and is younger than META_CACHE_TTL."""
+    try:
+        return time.time() - info_json.stat().st_mtime < META_CACHE_TTL
+    except FileNotFoundError:
+        return False
 
 
 def build_ytdlp_command(
@@ -64,8 +94,15 @@ def build_ytdlp_command(
     audio_quality: str,
     playlist_items: int | None = None,
     embed_metadata: bool = True,
+    info_json: Path | None = None,
+    concurrent_fragments: int = 1,
 ) -> list[str]:
-    """Build yt-dlp command with specified options."""
+    """
+    Build yt-dlp command with specified options.
+
+    If info_json is given, fresh cached metadata there is loaded instead of
+    extracting the URL again; otherwise yt-dlp writes its metadata there.
+    """
 
     # Map quality strings to yt-dlp values
     quality_map = {
@@ -83,14 +120,26 @@ def build_ytdlp_command(
         "--audio-format", audio_format,
         "--audio-quality", quality,
         "-o", output_template,
+        "--cache-dir", str(YTDLP_CACHE_DIR),
     ]
 
     if embed_metadata:
         cmd.extend(["--embed-metadata"])
 
+    if concurrent_fragments > 1:
+        cmd.extend(["--concurrent-fragments", str(concurrent_fragments)])
+
     if playlist_items is not None:
         cmd.extend(["--playlist-items", f"1:{playlist_items}"])
 
+    if info_json is not None:
+        if is_info_json_fresh(info_json):
+            cmd.extend(["--load-info-json", str(info_json)])
+            return cmd
+        # yt-dlp appends ".info.json" to the infojson output template
+        info_template = str(info_json)[: -len(".info.json")]
+        cmd.extend(["--write-info-json", "-o", f"infojson:{info_template}"])
+
     cmd.append(url)
 
     return cmd
@@ -121,6 +170,74 @@ def run_download(cmd: list[str]) -> bool:
         return False
 
 
+def download_url(
+    url: str,
+    output_dir: Path,
+    audio_format: str,
+    audio_quality: str,
+    playlist_items: int | None = None,
+    embed_metadata: bool = True,
+    concurrent_fragments: int = 1,
+) -> bool:
+    """Download a URL with yt-dlp, reusing cached metadata for single videos."""
+    # Only single videos are cached, playlist metadata would go stale quickly
+    info_json = None
+    if playlist_items is None and is_single_video_url(url):
+        META_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        info_json = get_info_json_path(url)
+    used_cache = info_json is not None and is_info_json_fresh(info_json)
+
+    def build_command() -> list[str]:
+        return build_ytdlp_command(
+            url=url,
+            output_dir=output_dir,
+            audio_format=audio_format,
+            audio_quality=audio_quality,
+            playlist_items=playlist_items,
+            embed_metadata=embed_metadata,
+            info_json=info_json,
+            concurrent_fragments=concurrent_fragments,
+        )
+
+    success = run_download(build_command())
+    if not success and used_cache:
+        # Cached stream URLs may have expired early, extract again
+        print("Retrying without cached metadata...", file=sys.stderr)
+        info_json.unlink(missing_ok=True)
+        success = run_download(build_command())
+    return success
+
+
+def list_playlist_entries(url: str, playlist_items: int | None = None) -> list[str]:
+    """List entry URLs of a playlist without extracting each video."""
+    cmd = ["yt-dlp", "--flat-playlist", "--print", "url", "--cache-dir", str(YTDLP_CACHE_DIR)]
+    if playlist_items is not None:
+        cmd.extend(["--playlist-items", f"1:{playlist_items}"])
+    cmd.append(url)
+
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return [line for line in result.stdout.splitlines() if line and line != "NA"]
+
+
+def download_playlist(url: str, parallel: int, playlist_items: int | None = None, **download_options) -> bool:
+    """Download playlist entries concurrently, one yt-dlp process per entry."""
+    try:
+        entries = list_playlist_entries(url, playlist_items)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        entries = []
+
+    if not entries:
+        # Nothing yt-dlp could flatten, download the URL as a whole
+        return download_url(url, playlist_items=playlist_items, **download_options)
+
+    print(f"Downloading {len(entries)} items, {parallel} at a time...")
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        results = list(executor.map(lambda entry: download_url(entry, **download_options), entries))
+
+    print(f"\n{sum(results)}/{len(entries)} items downloaded")
+    return all(results)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download audio from YouTube and Twitter/X links"
@@ -149,6 +266,20 @@ def main():
         metavar="N",
         help="Download only first N items from playlists",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Download up to N playlist items at once (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrent-fragments",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Fragments of a DASH/HLS stream to download in parallel (default: 4)",
+    )
     parser.add_argument(
         "--no-metadata",
         action="store_true",
@@ -157,8 +288,9 @@ def main():
 
     args = parser.parse_args()
 
-    # Validate URL
-    if not validate_url(args.url):
+    # Validate URL and identify platform
+    platform = classify_url(args.url)
+    if platform is None:
         print(
             f"Error: Unsupported URL. Only YouTube and Twitter/X URLs are supported.",
             file=sys.stderr,
@@ -168,24 +300,24 @@ def main():
     # Create output directory
     args.output.mkdir(parents=True, exist_ok=True)
 
-    # Identify platform
-    platform = get_platform(args.url)
     print(f"Downloading from {platform}...")
     print(f"Output directory: {args.output}")
     print(f"Audio format: {args.format}")
     print()
 
-    # Build and run command
-    cmd = build_ytdlp_command(
-        url=args.url,
-        output_dir=args.output,
-        audio_format=args.format,
-        audio_quality=args.quality,
-        playlist_items=args.playlist_items,
-        embed_metadata=not args.no_metadata,
-    )
+    download_options = {
+        "output_dir": args.output,
+        "audio_format": args.format,
+        "audio_quality": args.quality,
+        "embed_metadata": not args.no_metadata,
+        "concurrent_fragments": args.concurrent_fragments,
+    }
+    if args.parallel > 1 and not is_single_video_url(args.url):
+        success = download_playlist(args.url, args.parallel, args.playlist_items, **download_options)
+    else:
+        success = download_url(args.url, playlist_items=args.playlist_items, **download_options)
 
-    if run_download(cmd):
+    if success:
         print("\nDownload complete!")
         print(f"Files saved to: {args.output}")
         sys.exit(0)
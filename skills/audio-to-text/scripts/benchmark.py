@@ -11,16 +11,23 @@ import sys
 import time
 from pathlib import Path
 
+# Bounded header probes first, full probe only as a fallback
+DURATION_PROBES = [
+    ["-analyzeduration", "1000000", "-probesize", "1000000", "-show_entries", "format=duration"],
+    ["-analyzeduration", "1000000", "-probesize", "1000000", "-show_entries", "stream=duration"],
+    ["-show_entries", "format=duration"],
+]
+
 def get_audio_duration(audio_path: Path) -> float:
     """Get audio duration using ffprobe."""
-    cmd = [
-        "ffprobe", "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(audio_path)
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return float(result.stdout.strip())
+    for probe in DURATION_PROBES:
+        cmd = ["ffprobe", *probe, "-of", "default=noprint_wrappers=1:nokey=1", str(audio_path)]
+        # float() parses bytes directly, no need to decode the output
+        output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+        for value in output.split():
+            if value != b"N/A":
+                return float(value)
+    raise ValueError(f"Could not determine duration of {audio_path}")
 
 def benchmark_faster_whisper(audio_path: Path, model: str = "small") -> dict:
     """Benchmark faster-whisper."""
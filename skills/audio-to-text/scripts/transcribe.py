@@ -8,12 +8,21 @@ Optimized for Apple Silicon.
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import importlib
 import json
+import math
+import os
+import shutil
 import subprocess
 import sys
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Container, Iterator, Optional
 
 # mlx-whisper import
 try:
@@ -22,29 +31,88 @@ try:
 except ImportError:
     HAS_MLX_WHISPER = False
 
+# orjson is optional, used for faster progress and output serialization
+try:
+    import orjson
+
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+    json_loads = json.loads
+
 
 class ProgressTracker:
-    """Track transcription progress for resume support."""
+    """Track transcription progress for resume support.
 
-    def __init__(self, audio_path: Path):
+    Segments are appended to a JSONL sidecar as each chunk completes, so the
+    progress file itself stays small and is replaced atomically on every save.
+    Progress is only resumed by a run using the same chunk length; `resumed`
+    tells whether it was.
+    """
+
+    def __init__(self, audio_path: Path, chunk_seconds: int):
         self.progress_file = audio_path.parent / f".{audio_path.stem}.progress.json"
+        self.segments_file = audio_path.parent / f".{audio_path.stem}.segments.jsonl"
+        self.chunk_seconds = chunk_seconds
+        self.resumed = False
         self.data = self._load()
+        self._repair_segments()
 
     def _load(self) -> dict:
         if self.progress_file.exists():
-            return json.loads(self.progress_file.read_text())
-        return {"completed_chunks": [], "language": None, "segments": []}
+            data = json_loads(self.progress_file.read_bytes())
+            if "segments" not in data and data.get("chunk_seconds") == self.chunk_seconds:
+                self.resumed = True
+                return data
+            # Older progress files kept segments inline without chunk indices, and
+            # chunks cut at another length don't line up with this run's offsets,
+            # start over rather than resume with segments we can't place
+            self.segments_file.unlink(missing_ok=True)
+            return {"completed_chunks": [], "language": data.get("language"), "chunk_seconds": self.chunk_seconds}
+        return {"completed_chunks": [], "language": None, "chunk_seconds": self.chunk_seconds}
+
+    def _repair_segments(self):
+        """Drop a partial last line left by an interrupted write, and forget
+        completed chunks whose segments never made it to disk."""
+        if not self.segments_file.exists():
+            recorded = set()
+        else:
+            content = self.segments_file.read_bytes()
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                # Otherwise the next append would continue the broken line
+                with self.segments_file.open("r+b") as f:
+                    f.truncate(end)
+            recorded = set()
+            for line in content[:end].splitlines():
+                try:
+                    recorded.add(json_loads(line)["chunk"])
+                except json.JSONDecodeError:
+                    continue
+        completed = self.data["completed_chunks"]
+        if any(idx not in recorded for idx in completed):
+            self.data["completed_chunks"] = [idx for idx in completed if idx in recorded]
+            self.save()
 
     def save(self):
-        self.progress_file.write_text(json.dumps(self.data))
+        temp_file = self.progress_file.with_suffix(".tmp")
+        temp_file.write_text(json_dumps(self.data), encoding="utf-8")
+        os.replace(temp_file, self.progress_file)
 
     def is_chunk_completed(self, chunk_idx: int) -> bool:
         return chunk_idx in self.data["completed_chunks"]
 
     def mark_chunk_completed(self, chunk_idx: int, segments: list):
-        if chunk_idx not in self.data["completed_chunks"]:
-            self.data["completed_chunks"].append(chunk_idx)
-            self.data["segments"].extend(segments)
+        if chunk_idx in self.data["completed_chunks"]:
+            return
+        with self.segments_file.open("a", encoding="utf-8") as f:
+            f.write(json_dumps({"chunk": chunk_idx, "segments": segments}) + "\n")
+        self.data["completed_chunks"].append(chunk_idx)
         self.save()
 
     def get_detected_language(self) -> Optional[str]:
@@ -54,49 +122,185 @@ class ProgressTracker:
         self.data["language"] = lang
         self.save()
 
+    def get_chunk_segments(self) -> dict[int, list]:
+        """Segments of every completed chunk, keyed by chunk index."""
+        if not self.segments_file.exists():
+            return {}
+        completed = set(self.data["completed_chunks"])
+        chunk_segments = {}
+        with self.segments_file.open("rb") as f:
+            for line in f:
+                try:
+                    record = json_loads(line)
+                except json.JSONDecodeError:
+                    # Corrupt line, its chunk was dropped from completed_chunks on load
+                    continue
+                # Records for chunks never marked completed are left over from a crash
+                if record["chunk"] in completed:
+                    chunk_segments[record["chunk"]] = record["segments"]
+        return chunk_segments
+
     def get_segments(self) -> list:
-        return self.data.get("segments", [])
+        chunk_segments = self.get_chunk_segments()
+        return [seg for idx in sorted(chunk_segments) for seg in chunk_segments[idx]]
 
     def cleanup(self):
-        if self.progress_file.exists():
-            self.progress_file.unlink()
+        for path in (self.progress_file, self.segments_file):
+            if path.exists():
+                path.unlink()
 
 
-def get_audio_duration(audio_path: Path) -> float:
-    """Get audio duration using ffprobe."""
-    cmd = [
-        "ffprobe", "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(audio_path)
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return float(result.stdout.strip())
+# Chunk transcriptions are reused across runs for a week
+TRANSCRIPT_CACHE_DIR = Path.home() / ".cache" / "sancho-transcripts"
+TRANSCRIPT_CACHE_TTL = 7 * 86400
 
 
-def split_audio(audio_path: Path, chunk_minutes: int, temp_dir: Path) -> list[Path]:
-    """Split audio into chunks using ffmpeg."""
-    duration = get_audio_duration(audio_path)
-    chunk_seconds = chunk_minutes * 60
-    chunks = []
+def file_sha256(path: Path) -> str:
+    """Hash file contents without reading the whole file into memory."""
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Cache transcriptions keyed on audio content, model, language and decode options.
+
+    Chunk WAVs are produced with fixed ffmpeg flags, so identical audio gives
+    identical bytes and re-running on the same file hits the cache.
+    """
 
-    num_chunks = int(duration // chunk_seconds) + (1 if duration % chunk_seconds > 0 else 0)
+    def __init__(self, cache_dir: Path = TRANSCRIPT_CACHE_DIR, ttl: float = TRANSCRIPT_CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.prune()
 
-    for i in range(num_chunks):
-        start_time = i * chunk_seconds
-        chunk_path = temp_dir / f"chunk_{i:04d}.wav"
+    def prune(self):
+        """Delete entries, and temp files left by interrupted writes, older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                try:
+                    if entry.name.endswith((".json", ".tmp")) and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    # Removed by another run pruning at the same time
+                    continue
+
+    def key(self, audio_path: Path, mlx_model: str, language: Optional[str], options: dict) -> str:
+        options_str = ",".join(f"{k}={v}" for k, v in sorted(options.items()))
+        return hashlib.sha256(
+            f"{file_sha256(audio_path)}:{mlx_model}:{language}:{options_str}".encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple[list[dict], Optional[str]]]:
+        entry = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - entry.stat().st_mtime > self.ttl:
+                entry.unlink()
+                return None
+            data = json_loads(entry.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+        return data["segments"], data["language"]
+
+    def set(self, key: str, segments: list[dict], language: Optional[str]):
+        entry = self.cache_dir / f"{key}.json"
+        # Unique temp name, workers may store entries concurrently
+        temp_file = entry.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_file.write_text(json_dumps({"segments": segments, "language": language}), encoding="utf-8")
+        os.replace(temp_file, entry)
+
+
+# Probe passes tried in order: a bounded probe that reads only the container
+# header, the same bounded probe on stream headers, then an unbounded probe
+DURATION_PROBES = [
+    ["-analyzeduration", "1000000", "-probesize", "1000000", "-show_entries", "format=duration"],
+    ["-analyzeduration", "1000000", "-probesize", "1000000", "-show_entries", "stream=duration"],
+    ["-show_entries", "format=duration"],
+]
+
+
+@functools.lru_cache(maxsize=32)
+def _probe_duration(path: str, mtime_ns: int) -> float:
+    for probe in DURATION_PROBES:
+        cmd = ["ffprobe", *probe, "-of", "default=noprint_wrappers=1:nokey=1", path]
+        # float() parses bytes directly, no need to decode the output
+        output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+        for value in output.split():
+            if value != b"N/A":
+                return float(value)
+    raise ValueError(f"Could not determine duration of {path}")
 
-        cmd = [
-            "ffmpeg", "-y", "-i", str(audio_path),
-            "-ss", str(start_time),
-            "-t", str(chunk_seconds),
-            "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le",
-            str(chunk_path)
-        ]
-        subprocess.run(cmd, capture_output=True, check=True)
-        chunks.append(chunk_path)
 
-    return chunks
+def get_audio_duration(audio_path: Path) -> float:
+    """Get audio duration using ffprobe, cached per file path and modification time."""
+    return _probe_duration(str(audio_path), audio_path.stat().st_mtime_ns)
+
+
+def iter_split_audio(
+    audio_path: Path,
+    duration: float,
+    chunk_minutes: int,
+    chunks_dir: Path,
+    skip: Container[int] = ()
+) -> Iterator[tuple[int, Path]]:
+    """Split audio into chunks in a single ffmpeg pass, yielding each chunk as soon as it is written.
+
+    ffmpeg's segment muxer cuts the whole file with one decode and reports every
+    finished segment on stdout, so splitting overlaps with whatever the caller
+    does with the chunk. Finished segments are renamed to chunk_NNNN.wav, and
+    chunks already in `chunks_dir` from an interrupted run are reused as is.
+    Chunk indices in `skip` are discarded, and a leading run of chunks that
+    need no splitting is seeked past instead of decoded.
+    """
+    chunk_seconds = chunk_minutes * 60
+    num_chunks = math.ceil(duration / chunk_seconds)
+    needed = [i for i in range(num_chunks) if i not in skip]
+
+    ready = set()
+    for i in needed:
+        chunk_path = chunks_dir / f"chunk_{i:04d}.wav"
+        if chunk_path.exists():
+            ready.add(i)
+            yield i, chunk_path
+
+    first = next((i for i in needed if i not in ready), None)
+    if first is None:
+        return
+
+    # ffmpeg writes part_NNNN.wav, only segments it reports finished become chunks
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error", "-nostats",
+        "-ss", str(first * chunk_seconds), "-i", str(audio_path),
+        "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le",
+        "-f", "segment", "-segment_time", str(chunk_seconds),
+        "-segment_start_number", str(first), "-reset_timestamps", "1",
+        "-segment_list", "pipe:1", "-segment_list_type", "flat",
+        str(chunks_dir / "part_%04d.wav")
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in proc.stdout:
+            part_path = chunks_dir / Path(line.strip()).name
+            i = int(part_path.stem.split("_")[1])
+            if i in skip or i in ready:
+                part_path.unlink(missing_ok=True)
+                continue
+            chunk_path = chunks_dir / f"chunk_{i:04d}.wav"
+            os.replace(part_path, chunk_path)
+            yield i, chunk_path
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+    finally:
+        # Caller stopped early, don't leave a stray ffmpeg behind
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
 
 
 # Model mapping for mlx-whisper
@@ -109,19 +313,82 @@ MLX_MODEL_MAP = {
 }
 
 
+def load_model(model_name: str) -> str:
+    """Load the mlx-whisper model once so per-chunk transcribe calls reuse it.
+
+    Returns the model path to pass as `path_or_hf_repo`; mlx_whisper.transcribe
+    finds the model already loaded under that path.
+    """
+    mlx_model = MLX_MODEL_MAP.get(model_name, model_name)
+    get_model(mlx_model)
+    return mlx_model
+
+
+def get_model(mlx_model: str):
+    """Return the mlx-whisper model for mlx_model from the cache mlx_whisper.transcribe uses."""
+    import mlx.core as mx
+
+    # mlx_whisper.transcribe is shadowed by the function of the same name
+    transcribe_module = importlib.import_module("mlx_whisper.transcribe")
+    holder = getattr(transcribe_module, "ModelHolder", None)
+    if holder is not None:
+        return holder.get_model(mlx_model, mx.float16)
+    if not hasattr(transcribe_module.load_model, "cache_info"):
+        # Older releases load weights on every call, memoize the loader instead
+        transcribe_module.load_model = functools.lru_cache(maxsize=1)(transcribe_module.load_model)
+    return transcribe_module.load_model(mlx_model, dtype=mx.float16)
+
+
+def detect_language(audio_path: Path, mlx_model: str, probe_path: Path) -> str:
+    """Detect the spoken language from the first 30 seconds of audio."""
+    import mlx.core as mx
+    from mlx_whisper.audio import N_FRAMES, log_mel_spectrogram, pad_or_trim
+
+    model = get_model(mlx_model)
+    if not model.is_multilingual:
+        return "en"
+
+    # Whisper only looks at one 30 second window to pick the language
+    subprocess.run([
+        "ffmpeg", "-y", "-loglevel", "error", "-nostats",
+        "-t", "30", "-i", str(audio_path),
+        "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", str(probe_path)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    try:
+        mel = log_mel_spectrogram(str(probe_path), n_mels=model.dims.n_mels)
+    finally:
+        probe_path.unlink(missing_ok=True)
+    mel = pad_or_trim(mel, N_FRAMES, axis=-2).astype(mx.float16)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
 def transcribe_chunk(
     chunk_path: Path,
-    model_name: str,
-    language: Optional[str] = None
+    mlx_model: str,
+    language: Optional[str] = None,
+    cache: Optional[TranscriptCache] = None,
+    format_type: str = "txt"
 ) -> tuple[list[dict], Optional[str]]:
-    """Transcribe a single audio chunk using mlx-whisper."""
-    mlx_model = MLX_MODEL_MAP.get(model_name, model_name)
+    """Transcribe a single audio chunk using a model prepared by load_model."""
+    options = {"word_timestamps": False}
+    if format_type == "txt":
+        # Plain text has no timing to keep consistent, so skip the re-decoding
+        # that conditioning on previous text triggers after a hallucination
+        options.update(condition_on_previous_text=False, no_speech_threshold=0.6)
+
+    if cache is not None:
+        key = cache.key(chunk_path, mlx_model, language, options)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
 
     result = mlx_whisper.transcribe(
         str(chunk_path),
         path_or_hf_repo=mlx_model,
         language=language,
-        task="transcribe"
+        task="transcribe",
+        **options
     )
 
     segments = result.get("segments", [])
@@ -134,37 +401,37 @@ def transcribe_chunk(
         })
 
     detected_lang = result.get("language")
+    if cache is not None:
+        cache.set(key, results, detected_lang)
     return results, detected_lang
 
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds to SRT timestamp format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    hours, rest = divmod(int(seconds * 1000), 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    secs, millis = divmod(rest, 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
 def write_output(segments: list[dict], output_path: Path, format_type: str, language: Optional[str] = None):
     """Write transcription to output file."""
     if format_type == "txt":
-        text = "\n".join(seg["text"] for seg in segments)
-        output_path.write_text(text, encoding="utf-8")
+        with output_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(seg["text"] + "\n" for seg in segments)
 
     elif format_type == "srt":
-        lines = []
-        for i, seg in enumerate(segments, 1):
-            start = format_timestamp(seg["start"])
-            end = format_timestamp(seg["end"])
-            lines.append(f"{i}\n{start} --> {end}\n{seg['text']}\n")
-        output_path.write_text("\n".join(lines), encoding="utf-8")
+        with output_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            for i, seg in enumerate(segments, 1):
+                start = format_timestamp(seg["start"])
+                end = format_timestamp(seg["end"])
+                f.write(f"{i}\n{start} --> {end}\n{seg['text']}\n\n")
 
     elif format_type == "json":
         data = {"segments": segments, "text": " ".join(seg["text"] for seg in segments)}
         if language:
             data["language"] = language
-        output_path.write_text(json.dumps(data, ensure_ascii=False, indent=2))
+        output_path.write_text(json_dumps(data, indent=True), encoding="utf-8")
 
 
 def main():
@@ -175,6 +442,8 @@ def main():
     parser.add_argument("--chunk-minutes", type=int, default=15, help="Minutes per chunk")
     parser.add_argument("--format", default="txt", choices=["txt", "srt", "json"])
     parser.add_argument("--language", help="Language code (auto-detect if not specified)")
+    parser.add_argument("--workers", type=int, default=1, help="Chunks to transcribe concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Don't reuse or store cached chunk transcriptions")
 
     args = parser.parse_args()
 
@@ -187,82 +456,117 @@ def main():
         return 1
 
     # Setup progress tracker
-    tracker = ProgressTracker(args.audio_file)
+    chunk_seconds = args.chunk_minutes * 60
+    tracker = ProgressTracker(args.audio_file, chunk_seconds)
 
     # Use saved language detection if resuming
     detected_lang = args.language or tracker.get_detected_language()
 
-    # Create temp directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        # Check if we need to split
-        duration = get_audio_duration(args.audio_file)
-        chunk_seconds = args.chunk_minutes * 60
-
-        if duration <= chunk_seconds:
-            # Short audio, transcribe directly
-            print(f"Audio duration: {duration/60:.1f} minutes, transcribing directly...")
-            print(f"Using model: {args.model} (mlx-whisper)")
-            segments, lang = transcribe_chunk(args.audio_file, args.model, detected_lang)
-            if lang:
-                detected_lang = lang
-        else:
-            # Long audio, process in chunks
-            print(f"Audio duration: {duration/60:.1f} minutes, splitting into chunks...")
-            chunks = split_audio(args.audio_file, args.chunk_minutes, temp_path)
-            print(f"Split into {len(chunks)} chunks")
-            print(f"Using model: {args.model} (mlx-whisper)")
-
-            all_segments = []
-
-            for i, chunk_path in enumerate(chunks):
-                if tracker.is_chunk_completed(i):
-                    print(f"Chunk {i+1}/{len(chunks)}: Already completed, skipping")
-                    # Load saved segments from progress
-                    continue
-
-                print(f"Chunk {i+1}/{len(chunks)}: Transcribing...", end=" ", flush=True)
-                try:
-                    segments, lang = transcribe_chunk(chunk_path, args.model, detected_lang)
-
-                    # Detect language from first chunk if not specified
-                    if i == 0 and lang and not detected_lang:
-                        detected_lang = lang
-                        tracker.set_detected_language(lang)
-                        print(f"[Detected language: {lang}]")
-
-                    # Adjust timestamps
-                    offset = i * chunk_seconds
-                    for seg in segments:
-                        seg["start"] += offset
-                        seg["end"] += offset
-
-                    all_segments.extend(segments)
-                    tracker.mark_chunk_completed(i, segments)
-                    print(f"✓ ({len(segments)} segments)")
-                except Exception as e:
-                    print(f"✗ Error: {e}")
-                    print(f"\nProgress saved. To resume, run the command again.", file=sys.stderr)
-                    return 1
-
-            # Load previously completed segments from tracker
-            saved_segments = tracker.get_segments()
-            if saved_segments:
-                all_segments = saved_segments + all_segments
-            segments = all_segments
-
-        # Determine output path
-        output_path = args.output or args.audio_file.with_suffix(f".{args.format}")
-
-        # Write output
-        write_output(segments, output_path, args.format, detected_lang)
-        print(f"\nTranscription saved to: {output_path}")
-        if detected_lang:
-            print(f"Detected language: {detected_lang}")
-
-        # Cleanup progress file on success
-        tracker.cleanup()
+    # Load the model once, every chunk reuses it
+    print(f"Loading model: {args.model} (mlx-whisper)")
+    mlx_model = load_model(args.model)
+    cache = None if args.no_cache else TranscriptCache()
+
+    # Check if we need to split
+    duration = get_audio_duration(args.audio_file)
+
+    if duration <= chunk_seconds:
+        # Short audio, transcribe directly
+        print(f"Audio duration: {duration/60:.1f} minutes, transcribing directly...")
+        segments, lang = transcribe_chunk(
+            args.audio_file, mlx_model, detected_lang, cache, args.format
+        )
+        if lang:
+            detected_lang = lang
+    else:
+        # Long audio, split and transcribe chunks as they are produced.
+        # Chunks live next to the audio so an interrupted run can reuse them.
+        num_chunks = math.ceil(duration / chunk_seconds)
+        chunks_dir = args.audio_file.parent / f".{args.audio_file.stem}.chunks"
+        if not tracker.resumed:
+            # Chunks without matching progress may have been cut at another length
+            shutil.rmtree(chunks_dir, ignore_errors=True)
+        chunks_dir.mkdir(exist_ok=True)
+        # Record the chunk length before any chunk is cut
+        tracker.save()
+        print(f"Audio duration: {duration/60:.1f} minutes, splitting into {num_chunks} chunks...")
+
+        if not detected_lang:
+            # Detect language up front so every chunk skips its own detection pass
+            detected_lang = detect_language(args.audio_file, mlx_model, chunks_dir / "probe.wav")
+            tracker.set_detected_language(detected_lang)
+            print(f"[Detected language: {detected_lang}]")
+
+        completed = set()
+        for i in range(num_chunks):
+            if tracker.is_chunk_completed(i):
+                print(f"Chunk {i+1}/{num_chunks}: Already completed, skipping")
+                completed.add(i)
+
+        # Segments of completed chunks from earlier runs, new chunks are added as they finish
+        chunk_segments = tracker.get_chunk_segments()
+        lock = threading.Lock()
+        # Bounds how many chunks are queued for transcription at once
+        slots = threading.Semaphore(args.workers)
+        failed = threading.Event()
+
+        def run_chunk(i: int, chunk_path: Path) -> None:
+            try:
+                segments, _ = transcribe_chunk(
+                    chunk_path, mlx_model, detected_lang, cache, args.format
+                )
+            except Exception:
+                failed.set()
+                print(f"Chunk {i+1}/{num_chunks}: ✗")
+                raise
+            finally:
+                slots.release()
+            # Failed chunks stay on disk for the next run
+            chunk_path.unlink()
+
+            # Adjust timestamps
+            offset = i * chunk_seconds
+            for seg in segments:
+                seg["start"] += offset
+                seg["end"] += offset
+
+            with lock:
+                chunk_segments[i] = segments
+                tracker.mark_chunk_completed(i, segments)
+            print(f"Chunk {i+1}/{num_chunks}: ✓ ({len(segments)} segments)")
+
+        try:
+            futures = []
+            chunks = iter_split_audio(args.audio_file, duration, args.chunk_minutes, chunks_dir, skip=completed)
+            with ThreadPoolExecutor(max_workers=args.workers) as executor, closing(chunks):
+                for i, chunk_path in chunks:
+                    slots.acquire()
+                    if failed.is_set():
+                        break
+                    futures.append(executor.submit(run_chunk, i, chunk_path))
+            for future in futures:
+                future.result()
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            print(f"\nProgress saved. To resume, run the command again.", file=sys.stderr)
+            return 1
+
+        # Chunks finish out of order when run concurrently
+        segments = [seg for i in sorted(chunk_segments) for seg in chunk_segments[i]]
+
+    # Determine output path
+    output_path = args.output or args.audio_file.with_suffix(f".{args.format}")
+
+    # Write output
+    write_output(segments, output_path, args.format, detected_lang)
+    print(f"\nTranscription saved to: {output_path}")
+    if detected_lang:
+        print(f"Detected language: {detected_lang}")
+
+    # Cleanup progress file and leftover chunks on success
+    tracker.cleanup()
+    if duration > chunk_seconds:
+        shutil.rmtree(chunks_dir, ignore_errors=True)
 
     return 0
 
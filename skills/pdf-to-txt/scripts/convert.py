@@ -4,16 +4,21 @@ PDF to Text converter using PyMuPDF4LLM
 """
 
 import argparse
+import re
 import sys
 from pathlib import Path
 
 try:
+    import pymupdf
     import pymupdf4llm
 except ImportError:
     print("Error: pymupdf4llm is not installed.")
     print("Install it with: pip install pymupdf4llm")
     sys.exit(1)
 
+# Runs of blank lines collapsed in plain-text output
+MULTI_NEWLINE = re.compile(r'\n{3,}')
+
 
 def convert_pdf_to_text(pdf_path: str, output_path: str = None, markdown: bool = False, page_range: str = None) -> str:
     """
@@ -66,33 +71,36 @@ def convert_pdf_to_text(pdf_path: str, output_path: str = None, markdown: bool =
     print(f"📄 Converting: {pdf_file.name}")
 
     try:
-        # Convert PDF to text
         if pages:
             print(f"   Pages: {page_range}")
-            text = pymupdf4llm.to_markdown(
-                str(pdf_file),
-                pages=pages,
-                page_chunks=False
-            )
-        else:
-            text = pymupdf4llm.to_markdown(
-                str(pdf_file),
-                page_chunks=False
-            )
-
-        # Convert to plain text if markdown is not requested
-        if not markdown:
-            # Simple cleanup to make it more plain-text friendly
-            # Remove excessive whitespace but keep paragraph structure
-            import re
-            text = re.sub(r'\n{3,}', '\n\n', text)
-            text = text.strip()
-
-        # Write output
-        output_file.write_text(text, encoding='utf-8')
+
+        # Convert and write one page at a time, so only one page's text is held in memory
+        size = 0
+        with pymupdf.open(str(pdf_file)) as doc, \
+                open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+            first, last = pages if pages else (0, doc.page_count - 1)
+            for page_num in range(max(first, 0), min(last, doc.page_count - 1) + 1):
+                text = pymupdf4llm.to_markdown(doc, pages=[page_num])
+
+                # Convert to plain text if markdown is not requested
+                if not markdown:
+                    # Simple cleanup to make it more plain-text friendly
+                    # Remove excessive whitespace but keep paragraph structure
+                    if '\n\n\n' in text:
+                        text = MULTI_NEWLINE.sub('\n\n', text)
+                    text = text.strip()
+                    if not text:
+                        continue
+                    # Pages are separated like paragraphs
+                    if size:
+                        f.write("\n\n")
+                        size += 2
+
+                f.write(text)
+                size += len(text)
 
         print(f"✅ Saved to: {output_file}")
-        print(f"   Size: {len(text):,} characters")
+        print(f"   Size: {size:,} characters")
 
         return str(output_file)
 
@@ -4,36 +4,95 @@ Podcast download helper script.
 Supports 小宇宙 (Xiaoyuzhou.fm) single episode, Apple Podcasts, and generic RSS feeds.
 
 Usage:
-    python download.py <URL> [--output <dir>]
+    python download.py <URL> [<URL> ...] [--output <dir>]
 
 Examples:
     python download.py "https://www.xiaoyuzhoufm.com/episode/6982c33dc78b82389298d08d"
     python download.py "https://podcasts.apple.com/podcast/id360084272?i=1000748569801"
     python download.py "<URL>" --output ~/Downloads
+    python download.py "<URL1>" "<URL2>" --parallel 2
 """
 
 import argparse
+import functools
+import hashlib
+import io
+import os
 import re
 import sys
-import urllib.request
-from dataclasses import dataclass
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 from urllib.parse import urlparse, parse_qs
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Optional import for RSS feeds
+# Optional import, used for RSS feeds that aren't well-formed XML
 try:
     import feedparser
     HAS_FEEDPARSER = True
 except ImportError:
     HAS_FEEDPARSER = False
 
-
-@dataclass
+# Episodes are fetched as concurrent byte ranges when the server allows it
+DOWNLOAD_SEGMENTS = 4
+# Below this per-segment size one stream is about as fast as several
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+# Segments are fetched in ranges of at most this size, and finished ranges are
+# recorded so an interrupted download only refetches the ranges in flight
+MAX_RANGE_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# raw_decode parses one JSON value out of a larger string and reports where it ended
+JSON_DECODER = json.JSONDecoder()
+
+# Responses revalidated with ETag / Last-Modified instead of refetched
+HTTP_CACHE_DIR = Path.home() / ".cache" / "podcast-download"
+
+ITUNES_NS = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+# Most recent episodes returned by the iTunes lookup (the API maximum)
+ITUNES_EPISODE_LIMIT = 200
+# A podcast's feed URL rarely changes; episodes newer than the cached lookup
+# are still found through the Apple page title
+ITUNES_LOOKUP_TTL = 7 * 24 * 60 * 60
+
+# Enclosure URLs treated as audio when the type doesn't say so
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".aac", ".ogg")
+
+XIAOYUZHOU_HOSTS = frozenset({"xiaoyuzhoufm.com", "www.xiaoyuzhoufm.com"})
+APPLE_PODCASTS_HOSTS = frozenset({"podcasts.apple.com", "www.podcasts.apple.com"})
+XIAOYUZHOU_EPISODE_PATH_RE = re.compile(r'^/episode/([^/]+)/?$')
+APPLE_PODCAST_ID_RE = re.compile(r'id(\d+)')
+# \w is str.isalnum() plus '_', so this keeps alphanumerics, space, '-' and '_'
+UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w \-]')
+CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+TITLE_RE = re.compile(r'<title>([^<]+)</title>')
+APPLE_TITLE_SUFFIX_RE = re.compile(r'\s+-\s+Apple Podcasts$')
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# Shared session so the iTunes API, Apple pages, feeds and downloads reuse keep-alive connections
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers["User-Agent"] = USER_AGENT
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+HTTP_SESSION.mount("http://", HTTP_ADAPTER)
+HTTP_SESSION.mount("https://", HTTP_ADAPTER)
+
+
+@dataclass(slots=True)
 class Episode:
     """Represents a podcast episode."""
     title: str
@@ -43,36 +102,127 @@ class Episode:
     podcast_name: str = ""
     duration: Optional[str] = None
     file_size: Optional[int] = None
+    # File extension from audio_url, computed once
+    _ext: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._ext = Path(urlparse(self.audio_url).path).suffix[1:] or "mp3"
 
     def format_filename(self, template: str = "{date}_{title}.{ext}") -> str:
         """Generate filename based on template."""
         date_str = self.published.strftime("%Y%m%d")
-        safe_title = "".join(c for c in self.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = UNSAFE_FILENAME_CHARS_RE.sub('', self.title).rstrip()
         safe_title = safe_title.replace(' ', '_')
 
-        # Extract extension from audio_url
-        ext = Path(urlparse(self.audio_url).path).suffix[1:] or "mp3"
-
         filename = template.format(
             title=safe_title,
             date=date_str,
             podcast=self.podcast_name,
-            ext=ext
+            ext=self._ext
         )
         return filename
 
 
+def fetch_cached(
+    url: str,
+    timeout: int = 30,
+    max_age: int = 0,
+    validate: Optional[Callable[[bytes], bool]] = None
+) -> bytes:
+    """
+    GET url, revalidating a previously cached copy with a conditional request.
+
+    Returns the response body. A 304 reuses the cached bytes; responses
+    without an ETag or Last-Modified header are not cached. With max_age,
+    a cached copy younger than max_age seconds is returned without any
+    request, and responses are cached even without validators. With
+    validate, only bodies it accepts are cached or reused.
+    """
+    key = hashlib.sha256(url.encode()).hexdigest()
+    body_path = HTTP_CACHE_DIR / f"{key}.body"
+    meta_path = HTTP_CACHE_DIR / f"{key}.json"
+
+    headers = {}
+    if body_path.exists() and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except ValueError:
+            meta = {}
+        if validate is not None and not validate(body_path.read_bytes()):
+            # Cached before validation, refetch it unconditionally
+            meta = {}
+        elif max_age and time.time() - meta.get("fetched_at", 0) < max_age:
+            return body_path.read_bytes()
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = HTTP_SESSION.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and headers:
+        body = body_path.read_bytes()
+        meta["fetched_at"] = time.time()
+        write_cache_files((meta_path, json.dumps(meta).encode()))
+        return body
+    response.raise_for_status()
+
+    body = response.content
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+    if (max_age or meta["etag"] or meta["last_modified"]) and (validate is None or validate(body)):
+        # Body first, so metadata never points at a missing or stale body
+        write_cache_files((body_path, body), (meta_path, json.dumps(meta).encode()))
+    return body
+
+
+def write_cache_files(*files: tuple[Path, bytes]):
+    """Atomically write (path, data) pairs into the HTTP cache, in order."""
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for path, data in files:
+        # Unique per process and thread, batch downloads can write the same entry concurrently
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+
+@functools.lru_cache(maxsize=16)
+def load_feed(feed_url: str) -> bytes:
+    """Fetch an RSS feed once per process, episodes in a batch often share a show."""
+    return fetch_cached(feed_url)
+
+
+@functools.lru_cache(maxsize=128)
+def load_itunes_lookup(podcast_id: str) -> dict:
+    """Fetch the iTunes lookup for a podcast, reusing it for ITUNES_LOOKUP_TTL."""
+    api_url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcastEpisode&limit={ITUNES_EPISODE_LIMIT}"
+    return json.loads(fetch_cached(api_url, max_age=ITUNES_LOOKUP_TTL, validate=has_itunes_feed_url))
+
+
+def has_itunes_feed_url(body: bytes) -> bool:
+    """Check that an iTunes lookup body names a feed, so error pages and empty results aren't reused."""
+    try:
+        results = json.loads(body).get("results")
+        return bool(results) and bool(results[0].get("feedUrl"))
+    except (ValueError, AttributeError):
+        return False
+
+
+@functools.lru_cache(maxsize=4096)
 def is_xiaoyuzhou_episode_url(url: str) -> bool:
     """Check if URL is a 小宇宙 single episode link."""
     parsed = urlparse(url)
     domain = parsed.netloc.lower()
 
-    if domain not in ("xiaoyuzhoufm.com", "www.xiaoyuzhoufm.com"):
+    if domain not in XIAOYUZHOU_HOSTS:
         return False
 
-    return re.match(r'^/episode/([^/]+)/?$', parsed.path) is not None
+    return XIAOYUZHOU_EPISODE_PATH_RE.match(parsed.path) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def is_apple_podcasts_episode_url(url: str) -> bool:
     """
     Check if URL is an Apple Podcasts episode link.
@@ -84,7 +234,7 @@ def is_apple_podcasts_episode_url(url: str) -> bool:
     parsed = urlparse(url)
     domain = parsed.netloc.lower()
 
-    if domain not in ("podcasts.apple.com", "www.podcasts.apple.com"):
+    if domain not in APPLE_PODCASTS_HOSTS:
         return False
 
     # Check for episode ID in query params
@@ -93,9 +243,10 @@ def is_apple_podcasts_episode_url(url: str) -> bool:
         return False
 
     # Check for podcast ID in path
-    return '/id' in parsed.path and re.search(r'id\d+', parsed.path) is not None
+    return '/id' in parsed.path and APPLE_PODCAST_ID_RE.search(parsed.path) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_apple_podcast_info(url: str) -> tuple:
     """
     Extract podcast ID and episode ID from Apple Podcasts URL.
@@ -105,7 +256,7 @@ def extract_apple_podcast_info(url: str) -> tuple:
     parsed = urlparse(url)
 
     # Extract podcast ID from path
-    match = re.search(r'id(\d+)', parsed.path)
+    match = APPLE_PODCAST_ID_RE.search(parsed.path)
     if not match:
         raise ValueError(f"Could not extract podcast ID from URL: {url}")
     podcast_id = match.group(1)
@@ -119,16 +270,16 @@ def extract_apple_podcast_info(url: str) -> tuple:
     return podcast_id, episode_id
 
 
-def get_apple_podcast_rss_feed(podcast_id: str) -> str:
-    """
-    Get RSS feed URL from Apple Podcasts using iTunes Lookup API.
+def lookup_apple_podcast(podcast_id: str, episode_id: str) -> tuple:
     """
-    api_url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
+    Get RSS feed URL and episode title from Apple Podcasts using iTunes Lookup API.
 
+    The lookup also lists the podcast's most recent episodes, which usually
+    include the requested one. Returns (feed_url, episode_title); the title is
+    None if the episode isn't listed.
+    """
     try:
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = load_itunes_lookup(podcast_id)
 
         if data.get("resultCount", 0) == 0:
             raise ValueError(f"Podcast not found: {podcast_id}")
@@ -141,7 +292,13 @@ def get_apple_podcast_rss_feed(podcast_id: str) -> str:
         if not feed_url:
             raise ValueError(f"No feed URL found for podcast: {podcast_id}")
 
-        return feed_url
+        episode_title = None
+        for result in results[1:]:
+            if str(result.get("trackId")) == episode_id:
+                episode_title = result.get("trackName")
+                break
+
+        return feed_url, episode_title
 
     except requests.RequestException as e:
         raise ConnectionError(f"Failed to fetch from iTunes API: {e}")
@@ -154,25 +311,27 @@ def get_episode_title_from_apple_page(url: str) -> tuple:
     Returns (title, podcast_name)
     """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = HTTP_SESSION.get(url, timeout=30)
         response.raise_for_status()
 
-        # Fix encoding: Apple may not set charset properly, use apparent_encoding
-        if response.encoding.lower() == 'iso-8859-1':
-            response.encoding = response.apparent_encoding
+        # Apple pages are UTF-8 but don't always declare a charset, and requests
+        # then assumes ISO-8859-1. Sniffing with apparent_encoding scans the whole page.
+        charset_match = CHARSET_RE.search(response.headers.get("Content-Type", ""))
+        response.encoding = charset_match.group(1) if charset_match else "utf-8"
 
         html = response.text
 
         # Extract title from <title> tag
         # Format: "Episode Title - Podcast Name - Apple Podcasts"
-        title_match = re.search(r'<title>([^<]+)</title>', html)
+        # The first <title> is near the top of the page, so jump straight to it
+        title_start = html.find('<title>')
+        title_match = None
+        if title_start >= 0:
+            title_match = TITLE_RE.match(html, title_start) or TITLE_RE.search(html, title_start + 1)
         if title_match:
             full_title = title_match.group(1).strip()
             # Remove " - Apple Podcasts" suffix
-            full_title = re.sub(r'\s+-\s+Apple Podcasts$', '', full_title)
+            full_title = APPLE_TITLE_SUFFIX_RE.sub('', full_title)
 
             # Try to split into episode title and podcast name
             parts = full_title.rsplit(' - ', 1)
@@ -188,126 +347,181 @@ def get_episode_title_from_apple_page(url: str) -> tuple:
         raise ConnectionError(f"Failed to fetch Apple Podcasts page: {e}")
 
 
-def parse_rss_feed_for_episode(feed_url: str, target_title: str) -> Optional[Episode]:
+def iter_feed_entries(feed_bytes: bytes) -> Iterator[tuple[str, dict]]:
     """
-    Parse RSS feed and find episode matching the target title.
+    Stream (podcast_name, entry) pairs from RSS feed bytes.
 
-    Handles truncated titles from Apple Podcasts pages by cleaning up '...' suffixes.
+    Entries hold only the fields _entry_to_episode reads, under feedparser's
+    key names. Each <item> is cleared once read, so memory stays flat. Atom
+    and RSS 1.0 feeds, whose entries are namespaced, are left to feedparser.
     """
+    podcast_name = "Unknown Podcast"
+    root_tag = None
+    has_name = False
+    has_items = False
+    in_item = False
+    for event, elem in ET.iterparse(io.BytesIO(feed_bytes), events=("start", "end")):
+        if event == "start":
+            if root_tag is None:
+                root_tag = elem.tag
+            if elem.tag == "item":
+                in_item = True
+            continue
+
+        if elem.tag == "item":
+            in_item = False
+            has_items = True
+            yield podcast_name, {
+                "title": (elem.findtext("title") or "").strip(),
+                "published": elem.findtext("pubDate") or "",
+                "description": elem.findtext("description") or "",
+                "itunes_duration": elem.findtext(f"{ITUNES_NS}duration") or "",
+                "enclosures": [
+                    {"href": enc.get("url", ""), "type": enc.get("type", ""), "length": enc.get("length")}
+                    for enc in elem.iter("enclosure")
+                ],
+            }
+            elem.clear()
+        elif elem.tag == "title" and not in_item and not has_name:
+            # The channel title comes before the items
+            podcast_name = (elem.text or "").strip() or podcast_name
+            has_name = True
+
+    if not has_items and root_tag != "rss":
+        yield from iter_feedparser_entries(feed_bytes)
+
+
+def iter_feedparser_entries(feed_bytes: bytes) -> Iterator[tuple[str, dict]]:
+    """Parse feed bytes with feedparser, yielding (podcast_name, entry) pairs like iter_feed_entries."""
     if not HAS_FEEDPARSER:
-        raise ImportError("feedparser is required for Apple Podcasts. Install with: pip install feedparser")
+        raise ImportError("feedparser is required for feeds that aren't well-formed RSS 2.0. Install with: pip install feedparser")
+    feed = feedparser.parse(feed_bytes)
+    podcast_name = feed.feed.get("title", "Unknown Podcast")
+    for entry in feed.entries:
+        yield podcast_name, entry
+
 
+def parse_rss_feed_for_episode(feed_url: str, target_title: str) -> Optional[Episode]:
+    """
+    Fetch RSS feed and find episode matching the target title.
+    """
     try:
-        feed = feedparser.parse(feed_url)
-
-        if not feed.entries:
-            raise ValueError("No episodes found in RSS feed")
-
-        podcast_name = feed.feed.get("title", "Unknown Podcast")
-
-        # Clean up target title (remove truncation markers and suffixes)
-        # Apple Podcasts pages often truncate titles with "..." and append " - Podcast Name"
-        cleaned_target = target_title
-        # Remove trailing " - Podcast Name" suffix if present
-        if " - " in cleaned_target:
-            cleaned_target = cleaned_target.rsplit(" - ", 1)[0]
-        # Remove "..." truncation marker
-        cleaned_target = cleaned_target.replace("...", "").strip()
-
-        # Try exact match first
-        for entry in feed.entries:
-            title = entry.get("title", "")
-            if title == target_title:
-                return _entry_to_episode(entry, podcast_name)
-
-        # Try case-insensitive match
-        target_lower = target_title.lower()
-        for entry in feed.entries:
-            title = entry.get("title", "")
-            if title.lower() == target_lower:
-                return _entry_to_episode(entry, podcast_name)
-
-        # Try partial match with cleaned title (handle truncation)
-        cleaned_target_lower = cleaned_target.lower()
-        for entry in feed.entries:
-            title = entry.get("title", "")
-            title_lower = title.lower()
-            # Check if cleaned target is contained in RSS title
-            if cleaned_target_lower in title_lower:
-                return _entry_to_episode(entry, podcast_name)
-            # Check if RSS title is contained in cleaned target
-            if title_lower in cleaned_target_lower:
-                return _entry_to_episode(entry, podcast_name)
-
-        # Try fuzzy matching: find the entry with highest similarity to cleaned target
-        best_match = None
-        best_score = 0
-        for entry in feed.entries:
-            title = entry.get("title", "")
-            # Simple similarity: length of common prefix
-            title_lower = title.lower()
-            min_len = min(len(cleaned_target_lower), len(title_lower))
-            common_len = 0
-            for i in range(min_len):
-                if cleaned_target_lower[i] == title_lower[i]:
-                    common_len += 1
-                else:
-                    break
-            # Score based on common prefix ratio
-            score = common_len / max(len(cleaned_target_lower), len(title_lower))
-            if score > best_score and score > 0.5:  # At least 50% match
-                best_score = score
-                best_match = entry
-
-        if best_match:
-            return _entry_to_episode(best_match, podcast_name)
-
-        raise ValueError(f"Could not find episode with title: {target_title}")
+        feed_bytes = load_feed(feed_url)
+    except Exception as e:
+        raise ValueError(f"Failed to parse RSS feed: {e}")
+    return find_episode_in_feed(feed_bytes, target_title)
+
+
+def find_episode_in_feed(feed_bytes: bytes, target_title: str) -> Episode:
+    """
+    Parse RSS feed bytes and find episode matching the target title.
+
+    Falls back to feedparser for feeds that aren't well-formed XML.
+    """
+    try:
+        try:
+            return _find_episode(iter_feed_entries(feed_bytes), target_title)
+        except ET.ParseError:
+            return _find_episode(iter_feedparser_entries(feed_bytes), target_title)
 
     except Exception as e:
         raise ValueError(f"Failed to parse RSS feed: {e}")
 
 
+def _find_episode(entries: Iterator[tuple[str, dict]], target_title: str) -> Episode:
+    """
+    Find the entry matching the target title.
+
+    Handles truncated titles from Apple Podcasts pages by cleaning up '...' suffixes.
+    An exact match returns before the rest of the feed is read.
+    """
+    # Clean up target title (remove truncation markers and suffixes)
+    # Apple Podcasts pages often truncate titles with "..." and append " - Podcast Name"
+    cleaned_target = target_title
+    # Remove trailing " - Podcast Name" suffix if present
+    if " - " in cleaned_target:
+        cleaned_target = cleaned_target.rsplit(" - ", 1)[0]
+    # Remove "..." truncation marker
+    cleaned_target = cleaned_target.replace("...", "").strip()
+
+    target_lower = target_title.lower()
+    cleaned_target_lower = cleaned_target.lower()
+
+    # One pass over the feed, keeping the first hit of each weaker tier:
+    # case-insensitive, then containment (handles truncation), then the
+    # longest common prefix. Exact matches return immediately.
+    podcast_name = "Unknown Podcast"
+    has_entries = False
+    ci_match = None
+    partial_match = None
+    best_match = None
+    best_score = 0.5  # At least 50% match
+    for podcast_name, entry in entries:
+        has_entries = True
+        title = entry.get("title", "")
+        if title == target_title:
+            return _entry_to_episode(entry, podcast_name)
+        if ci_match is not None:
+            continue
+
+        title_lower = title.lower()
+        if title_lower == target_lower:
+            ci_match = entry
+        elif partial_match is None:
+            # Cleaned target in RSS title, or RSS title in cleaned target
+            if cleaned_target_lower in title_lower or title_lower in cleaned_target_lower:
+                partial_match = entry
+            else:
+                # Score based on common prefix ratio
+                common_len = len(os.path.commonprefix((cleaned_target_lower, title_lower)))
+                score = common_len / max(len(cleaned_target_lower), len(title_lower))
+                if score > best_score:
+                    best_score = score
+                    best_match = entry
+
+    if not has_entries:
+        raise ValueError("No episodes found in RSS feed")
+
+    match = ci_match or partial_match or best_match
+    if match:
+        return _entry_to_episode(match, podcast_name)
+
+    raise ValueError(f"Could not find episode with title: {target_title}")
+
+
 def _entry_to_episode(entry, podcast_name: str) -> Episode:
-    """Convert a feedparser entry to Episode object."""
+    """Convert a feed entry (feedparser or iter_feed_entries) to Episode object."""
     title = entry.get("title", "Untitled")
 
     # Get audio URL from enclosures
     audio_url = None
     file_size = None
-    if entry.enclosures:
-        for enc in entry.enclosures:
-            enc_type = enc.get("type", "")
-            enc_url = enc.get("href", "")
-            if enc_type.startswith("audio/") or enc_url.endswith((".mp3", ".m4a", ".aac", ".ogg")):
-                audio_url = enc_url
-                file_size = enc.get("length")
-                break
-
-    if not audio_url and entry.enclosures:
+    enclosures = entry.get("enclosures") or []
+    for enc in enclosures:
+        enc_type = enc.get("type") or ""
+        enc_url = enc.get("href") or ""
+        if enc_type.startswith("audio/") or enc_url.endswith(AUDIO_EXTENSIONS):
+            audio_url = enc_url
+            file_size = enc.get("length")
+            break
+
+    if not audio_url and enclosures:
         # Take first enclosure if no audio type found
-        audio_url = entry.enclosures[0].get("href", "")
-        file_size = entry.enclosures[0].get("length")
+        audio_url = enclosures[0].get("href", "")
+        file_size = enclosures[0].get("length")
 
     if not audio_url:
         raise ValueError(f"No audio URL found for episode: {title}")
 
-    # Parse date
+    # Parse date (RSS uses RFC 822 dates, some feeds use ISO 8601)
     pub_date = entry.get("published", entry.get("updated", ""))
     try:
-        # Try common RSS date formats
-        from time import mktime
-        import time
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            published = datetime.fromtimestamp(mktime(entry.published_parsed))
-        else:
-            # Try parsing the date string
-            try:
-                published = datetime.strptime(pub_date[:25], "%a, %d %b %Y %H:%M:%S")
-            except:
-                published = datetime.now()
-    except:
-        published = datetime.now()
+        published = parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            published = datetime.now()
 
     # Description
     description = entry.get("description", entry.get("summary", ""))
@@ -332,25 +546,31 @@ def parse_apple_podcasts_episode(url: str) -> Episode:
 
     Process:
     1. Extract podcast ID and episode ID from URL
-    2. Get RSS feed URL from iTunes API
-    3. Extract episode title from Apple Podcasts page
+    2. Get RSS feed URL and episode title from iTunes API
+    3. Download the RSS feed; if the episode isn't listed by the API, extract
+       its title from the Apple Podcasts page at the same time
     4. Find matching episode in RSS feed
     """
     try:
         # Extract IDs
         podcast_id, episode_id = extract_apple_podcast_info(url)
 
-        # Get RSS feed URL
+        # Get RSS feed URL and, for recent episodes, the title
         print(f"   Fetching podcast feed...")
-        feed_url = get_apple_podcast_rss_feed(podcast_id)
+        feed_url, title = lookup_apple_podcast(podcast_id, episode_id)
 
-        # Get episode title from Apple page
-        print(f"   Extracting episode info...")
-        title, _ = get_episode_title_from_apple_page(url)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The feed and the Apple page don't depend on each other
+            feed_future = executor.submit(load_feed, feed_url)
+            if title is None:
+                # Get episode title from Apple page
+                print(f"   Extracting episode info...")
+                title, _ = get_episode_title_from_apple_page(url)
+            feed_bytes = feed_future.result()
 
         # Find episode in RSS feed
         print(f"   Searching for: {title}")
-        episode = parse_rss_feed_for_episode(feed_url, title)
+        episode = find_episode_in_feed(feed_bytes, title)
 
         return episode
 
@@ -362,49 +582,22 @@ def parse_apple_podcasts_episode(url: str) -> Episode:
 
 def extract_json_from_html(html: str, key: str) -> dict:
     """
-    Extract a JSON object from HTML by key using bracket matching.
-    Handles nested objects correctly.
+    Extract a JSON object from HTML by key.
+    The decoder stops at the end of the object, so nested objects and
+    trailing page content are handled without matching braces by hand.
     """
     pattern = f'"{key}":'
     start = html.find(pattern)
     if start < 0:
         raise ValueError(f"Could not find '{key}' in page")
 
-    # Start after the key and colon
-    json_start = start + len(pattern)
-
-    # Find the opening brace
-    while json_start < len(html) and html[json_start] != '{':
-        json_start += 1
-
-    if json_start >= len(html):
+    # Find the opening brace after the key and colon
+    json_start = html.find('{', start + len(pattern))
+    if json_start < 0:
         raise ValueError(f"Could not find JSON object for '{key}'")
 
-    # Match braces to find the end of the object
-    brace_count = 0
-    in_string = False
-    escape_next = False
-
-    for i, char in enumerate(html[json_start:]):
-        if escape_next:
-            escape_next = False
-            continue
-        if char == '\\':
-            escape_next = True
-            continue
-        if char == '"' and not in_string:
-            in_string = True
-        elif char == '"' and in_string:
-            in_string = False
-        elif char == '{' and not in_string:
-            brace_count += 1
-        elif char == '}' and not in_string:
-            brace_count -= 1
-            if brace_count == 0:
-                json_str = html[json_start:json_start + i + 1]
-                return json.loads(json_str)
-
-    raise ValueError(f"Could not find matching braces for '{key}'")
+    obj, _ = JSON_DECODER.raw_decode(html, json_start)
+    return obj
 
 
 def parse_xiaoyuzhou_episode(url: str) -> Episode:
@@ -412,12 +605,8 @@ def parse_xiaoyuzhou_episode(url: str) -> Episode:
     Parse 小宇宙 single episode page to extract audio URL.
     """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        html = response.text
+        # Episode pages are UTF-8; the cache revalidates them with a conditional GET
+        html = fetch_cached(url).decode("utf-8", errors="replace")
 
         # Extract episode JSON data using bracket matching
         episode_data = extract_json_from_html(html, "episode")
@@ -481,14 +670,168 @@ def parse_xiaoyuzhou_episode(url: str) -> Episode:
         raise ValueError(f"Failed to parse 小宇宙 episode: {e}")
 
 
-def download_episode(episode: Episode, output_dir: Path, template: str = "{date}_{title}.{ext}") -> Path:
+def get_range_download_info(url: str) -> Optional[tuple]:
+    """
+    Check whether the server supports byte range requests for url.
+
+    Returns (final_url, content_length), or None if ranges aren't supported.
+    """
+    with HTTP_SESSION.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            return None
+        # Content-Range: bytes 0-0/<total>
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        if not total.isdigit():
+            return None
+        # Segments request the post-redirect URL directly
+        return response.url, int(total)
+
+
+def preallocate(fd: int, size: int):
+    """Reserve size bytes for fd, so concurrent writes don't fragment the file."""
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, 0, size)
+    else:
+        os.ftruncate(fd, size)
+
+
+def download_range(url: str, fd: int, start: int, end: int):
+    """Download bytes start..end (inclusive) of url into fd at the same offset."""
+    range_headers = {"Range": f"bytes={start}-{end}"}
+    with HTTP_SESSION.get(url, headers=range_headers, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise ConnectionError("Server ignored range request")
+        offset = start
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+
+    if offset != end + 1:
+        raise ConnectionError(f"Incomplete segment: got {offset - start} of {end - start + 1} bytes")
+
+
+def load_finished_ranges(ranges_path: Path, total: int) -> set:
+    """Read the start offsets of finished ranges, empty unless recorded for a file of total bytes."""
+    try:
+        record = json.loads(ranges_path.read_text())
+        if record["size"] == total:
+            return set(record["done"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return set()
+
+
+def download_segments(url: str, total: int, part_path: Path, ranges_path: Path, segments: int):
+    """
+    Download total bytes of url into part_path over `segments` connections.
+
+    The start offset of every finished range is recorded in ranges_path, and
+    ranges already recorded there are skipped, so an interrupted download
+    resumes where it stopped.
+    """
+    range_size = min(-(-total // segments), MAX_RANGE_SIZE)
+    done = load_finished_ranges(ranges_path, total) if part_path.exists() else set()
+    bounds = [
+        (start, min(start + range_size, total) - 1)
+        for start in range(0, total, range_size)
+        if start not in done
+    ]
+    if done:
+        remaining = sum(end - start + 1 for start, end in bounds)
+        print(f"     ⏯️  Resuming with {(total - remaining) / 1024 / 1024:.1f} MB done")
+    lock = threading.Lock()
+
+    def record_range(start: int):
+        done.add(start)
+        temp_path = ranges_path.with_name(f"{ranges_path.name}.tmp")
+        temp_path.write_text(json.dumps({"size": total, "done": sorted(done)}))
+        os.replace(temp_path, ranges_path)
+
+    def fetch_range(bound: tuple):
+        download_range(url, fd, *bound)
+        with lock:
+            record_range(bound[0])
+
+    # Recorded ranges are only valid for the part file they were written to
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | (0 if done else os.O_TRUNC), 0o644)
+    try:
+        if not done:
+            # Preallocate so every range can write at its own offset
+            preallocate(fd, total)
+            ranges_path.write_text(json.dumps({"size": total, "done": []}))
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [executor.submit(fetch_range, bound) for bound in bounds]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Stop at the first failure instead of fetching every queued range
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+    finally:
+        # The part file and ranges_path are kept for the next run to resume
+        os.close(fd)
+
+
+def download_stream(url: str, part_path: Path):
+    """Download url into part_path as a single stream, resuming a partial part file."""
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    stream_headers = {"Range": f"bytes={offset}-"} if offset else None
+
+    with HTTP_SESSION.get(url, headers=stream_headers, stream=True, timeout=60) as response:
+        if response.status_code == 416:
+            # Content-Range: bytes */<total>
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            if total.isdigit() and int(total) == offset:
+                # An earlier run finished the download but wasn't able to rename it
+                return
+            # Part file is longer than the remote file, it can't be a prefix of it
+            part_path.unlink()
+            return download_stream(url, part_path)
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            print(f"     ⏯️  Resuming at {offset / 1024 / 1024:.1f} MB")
+        else:
+            # Server sent the whole file
+            offset = 0
+        # Content-Length counts encoded bytes, iter_content yields decoded ones
+        expected = None
+        if "Content-Length" in response.headers and "Content-Encoding" not in response.headers:
+            expected = offset + int(response.headers["Content-Length"])
+
+        # Unbuffered, iter_content already hands over 1 MiB blocks
+        with open(part_path, 'ab' if offset else 'wb', buffering=0) as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+            size = f.tell()
+
+    if expected is not None and size != expected:
+        # Kept for the next run to resume
+        raise ConnectionError(f"Incomplete download: got {size} of {expected} bytes")
+
+
+def download_episode(
+    episode: Episode,
+    output_dir: Path,
+    template: str = "{date}_{title}.{ext}",
+    segments: int = DOWNLOAD_SEGMENTS
+) -> Path:
     """
     Download a single episode.
 
+    Large files are fetched as `segments` concurrent byte ranges when the
+    server supports it, otherwise as a single stream. Data goes to a .part
+    file that is renamed into place once complete; an interrupted download
+    is resumed from the part file on the next run.
+
     Returns the downloaded file path on success.
     """
     filename = episode.format_filename(template)
     output_path = output_dir / filename
+    part_path = output_path.with_name(f"{output_path.name}.part")
 
     # Skip if already exists
     if output_path.exists():
@@ -502,28 +845,36 @@ def download_episode(episode: Episode, output_dir: Path, template: str = "{date}
         # Create output directory if needed
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Download with urllib
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
+        # Finished ranges of a segmented download, see download_segments
+        ranges_path = part_path.with_name(f"{part_path.name}.ranges")
+        if not part_path.exists():
+            ranges_path.unlink(missing_ok=True)
 
-        req = urllib.request.Request(episode.audio_url, headers=headers)
-
-        with urllib.request.urlopen(req, timeout=60) as response:
-            with open(output_path, 'wb') as f:
-                while True:
-                    chunk = response.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+        range_info = None
+        # A part file left by an interrupted single stream is resumed as one
+        if segments > 1 and (ranges_path.exists() or not part_path.exists()):
+            range_info = get_range_download_info(episode.audio_url)
 
+        if range_info and range_info[1] >= segments * MIN_SEGMENT_SIZE:
+            download_segments(*range_info, part_path, ranges_path, segments)
+        else:
+            if ranges_path.exists():
+                # The part file has holes, a single stream can't append to it
+                part_path.unlink()
+                ranges_path.unlink()
+            download_stream(episode.audio_url, part_path)
+
+        os.replace(part_path, output_path)
+        ranges_path.unlink(missing_ok=True)
         print(f"     ✅ Complete")
         return output_path
 
-    except urllib.error.HTTPError as e:
-        raise ConnectionError(f"HTTP Error {e.code}: {e.reason}")
-    except urllib.error.URLError as e:
-        raise ConnectionError(f"URL Error: {e.reason}")
+    except requests.HTTPError as e:
+        raise ConnectionError(f"HTTP Error {e.response.status_code}: {e.response.reason}")
+    except requests.RequestException as e:
+        raise ConnectionError(f"Request Error: {e}")
+    except ConnectionError:
+        raise
     except Exception as e:
         raise RuntimeError(f"Download failed: {e}")
 
@@ -538,38 +889,76 @@ def detect_platform(url: str) -> str:
         return "unknown"
 
 
+def download_url(url: str, output_dir: Path, template: str = "{date}_{title}.{ext}", segments: int = DOWNLOAD_SEGMENTS) -> Path:
+    """Resolve an episode URL and download it. Returns the downloaded file path."""
+    platform = detect_platform(url)
+
+    if platform == "xiaoyuzhou":
+        print(f"🔍 Platform: 小宇宙 (Xiaoyuzhou.fm)")
+        print(f"📥 Parsing episode...")
+        episode = parse_xiaoyuzhou_episode(url)
+    elif platform == "apple":
+        print(f"🔍 Platform: Apple Podcasts")
+        print(f"📥 Resolving episode...")
+        episode = parse_apple_podcasts_episode(url)
+    else:
+        raise ValueError(f"Unsupported URL format: {url}")
+
+    print(f"📻 {episode.podcast_name} - {episode.title}")
+
+    print(f"\n⬇️  Downloading...")
+    return download_episode(episode, output_dir, template, segments)
+
+
+def download_urls(urls: list[str], parallel: int, **download_options) -> int:
+    """Download several episode URLs, `parallel` at a time. Returns the number that failed."""
+    def download_one(url: str) -> bool:
+        try:
+            download_url(url, **download_options)
+            return True
+        except Exception as e:
+            print(f"Error: {url}: {e}", file=sys.stderr)
+            return False
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        results = list(executor.map(download_one, urls))
+    return results.count(False)
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Download podcast episode from 小宇宙 (Xiaoyuzhou.fm) or Apple Podcasts"
+        description="Download podcast episodes from 小宇宙 (Xiaoyuzhou.fm) or Apple Podcasts"
     )
-    parser.add_argument("url", help="Episode URL (e.g., https://www.xiaoyuzhoufm.com/episode/<id> or https://podcasts.apple.com/...)")
+    parser.add_argument("urls", nargs="+", metavar="url", help="Episode URL(s) (e.g., https://www.xiaoyuzhoufm.com/episode/<id> or https://podcasts.apple.com/...)")
     parser.add_argument("-o", "--output", type=Path, default=Path.home() / "Downloads", help="Output directory (default: ~/Downloads)")
     parser.add_argument("--template", type=str, default="{date}_{title}.{ext}", help="Filename template")
+    parser.add_argument("--segments", type=int, default=DOWNLOAD_SEGMENTS, help=f"Parallel connections per download (default: {DOWNLOAD_SEGMENTS})")
+    parser.add_argument("--parallel", type=int, default=4, metavar="N", help="Episodes to download at once when several URLs are given (default: 4)")
 
     args = parser.parse_args()
 
-    try:
-        platform = detect_platform(args.url)
-
-        if platform == "xiaoyuzhou":
-            print(f"🔍 Platform: 小宇宙 (Xiaoyuzhou.fm)")
-            print(f"📥 Parsing episode...")
-            episode = parse_xiaoyuzhou_episode(args.url)
-        elif platform == "apple":
-            print(f"🔍 Platform: Apple Podcasts")
-            print(f"📥 Resolving episode...")
-            episode = parse_apple_podcasts_episode(args.url)
-        else:
-            print(f"Error: Unsupported URL format", file=sys.stderr)
-            print(f"Supported platforms:", file=sys.stderr)
-            print(f"  - 小宇宙: https://www.xiaoyuzhoufm.com/episode/<id>", file=sys.stderr)
-            print(f"  - Apple Podcasts: https://podcasts.apple.com/...?i=<episode_id>", file=sys.stderr)
-            return 1
+    unsupported = [url for url in args.urls if detect_platform(url) == "unknown"]
+    if unsupported:
+        for url in unsupported:
+            print(f"Error: Unsupported URL format: {url}", file=sys.stderr)
+        print(f"Supported platforms:", file=sys.stderr)
+        print(f"  - 小宇宙: https://www.xiaoyuzhoufm.com/episode/<id>", file=sys.stderr)
+        print(f"  - Apple Podcasts: https://podcasts.apple.com/...?i=<episode_id>", file=sys.stderr)
+        return 1
+
+    download_options = {
+        "output_dir": args.output,
+        "template": args.template,
+        "segments": args.segments,
+    }
 
-        print(f"📻 {episode.podcast_name} - {episode.title}")
+    try:
+        if len(args.urls) > 1:
+            failed = download_urls(args.urls, args.parallel, **download_options)
+            print(f"\n✅ Downloaded {len(args.urls) - failed}/{len(args.urls)} episodes to: {args.output}")
+            return 1 if failed else 0
 
-        print(f"\n⬇️  Downloading...")
-        output_path = download_episode(episode, args.output, args.template)
+        output_path = download_url(args.urls[0], **download_options)
 
         print(f"\n✅ Saved to: {output_path}")
         return 0
@@ -4,22 +4,62 @@
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
 DB_PATH = Path(__file__).parent.parent / "db" / "tasks.db"
 BACKUP_DIR = Path(__file__).parent.parent / "db" / "backup"
 
+STATUSES = ('Backlog', 'Todo', 'In progress', 'Done', 'Canceled')
+
+# Stored task fields, selected explicitly so the generated rank columns stay internal
+TASK_COLUMNS = 'id, title, description, status, priority, project, created_at, updated_at'
+
+# Generated sort keys, so listings can ORDER BY an index instead of CASE chains
+RANK_COLUMNS = {
+    'status_rank': '''
+        CASE status
+            WHEN 'In progress' THEN 1
+            WHEN 'Todo' THEN 2
+            WHEN 'Backlog' THEN 3
+            WHEN 'Done' THEN 4
+            WHEN 'Canceled' THEN 5
+        END
+    ''',
+    'priority_rank': '''
+        CASE priority
+            WHEN 'Urgent' THEN 1
+            WHEN 'High' THEN 2
+            WHEN 'Medium' THEN 3
+            WHEN 'Low' THEN 4
+        END
+    ''',
+}
+
+# Shared connection, opened on first use and kept for the life of the process
+CONNECTION = None
+WRITE_LOCK = threading.Lock()
+
 def get_connection():
-    """Get SQLite database connection"""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the shared SQLite database connection, creating or upgrading the schema on first use"""
+    global CONNECTION
+    if CONNECTION is None:
+        with WRITE_LOCK:
+            if CONNECTION is None:
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('PRAGMA temp_store=MEMORY')
+                conn.execute('PRAGMA cache_size=-20000')
+                create_schema(conn)
+                CONNECTION = conn
+    return CONNECTION
 
-def init_db():
-    """Initialize the database schema"""
-    conn = get_connection()
+def create_schema(conn):
+    """Create the tasks table and indexes, adding columns missing from older databases"""
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
@@ -33,88 +73,68 @@ def init_db():
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    # table_xinfo (unlike table_info) lists generated columns
+    columns = {row['name'] for row in cursor.execute('PRAGMA table_xinfo(tasks)')}
+    for name, expr in RANK_COLUMNS.items():
+        if name not in columns:
+            cursor.execute(f'ALTER TABLE tasks ADD COLUMN {name} INTEGER GENERATED ALWAYS AS ({expr}) VIRTUAL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_status_priority ON tasks(status, priority)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rank ON tasks(status_rank, priority_rank)
+        WHERE status NOT IN ('Done', 'Canceled')
+    ''')
     conn.commit()
-    conn.close()
+
+def init_db():
+    """Initialize the database schema"""
+    # The schema is created or upgraded when the connection is first opened
+    get_connection()
 
 def add_task(title: str, priority: str = 'Medium', status: str = 'Backlog', project: str = '', description: str = ''):
     """Add a new task"""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO tasks (title, description, status, priority, project)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (title, description, status, priority, project))
-    task_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with WRITE_LOCK:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO tasks (title, description, status, priority, project)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (title, description, status, priority, project))
+        task_id = cursor.lastrowid
+        conn.commit()
     return task_id
 
-def get_tasks(status_filter: str = None, show_done: bool = False):
+def get_tasks(project_filter: str = None, show_done: bool = False):
     """Get tasks with proper sorting"""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Status order for sorting
-    status_order = {
-        'In progress': 1,
-        'Todo': 2,
-        'Backlog': 3,
-        'Done': 4,
-        'Canceled': 5
-    }
-    priority_order = {
-        'Urgent': 1,
-        'High': 2,
-        'Medium': 3,
-        'Low': 4
-    }
-    
-    if status_filter:
-        cursor.execute('SELECT * FROM tasks WHERE project = ? ORDER BY status_order', (status_filter,))
+    if project_filter:
+        cursor.execute(f'SELECT {TASK_COLUMNS}, substr(created_at, 1, 10) AS created_date FROM tasks WHERE project = ? ORDER BY status_rank, priority_rank', (project_filter,))
+    elif show_done:
+        cursor.execute(f'SELECT {TASK_COLUMNS}, substr(created_at, 1, 10) AS created_date FROM tasks ORDER BY status_rank, priority_rank')
     else:
-        if show_done:
-            query = '''
-                SELECT * FROM tasks 
-                ORDER BY 
-                    CASE status 
-                        WHEN 'In progress' THEN 1 
-                        WHEN 'Todo' THEN 2 
-                        WHEN 'Backlog' THEN 3 
-                        WHEN 'Done' THEN 4 
-                        WHEN 'Canceled' THEN 5 
-                    END,
-                    CASE priority 
-                        WHEN 'Urgent' THEN 1 
-                        WHEN 'High' THEN 2 
-                        WHEN 'Medium' THEN 3 
-                        WHEN 'Low' THEN 4 
-                    END
-            '''
-            cursor.execute(query)
-        else:
-            cursor.execute('''
-                SELECT * FROM tasks 
-                WHERE status NOT IN ('Done', 'Canceled')
-                ORDER BY 
-                    CASE status 
-                        WHEN 'In progress' THEN 1 
-                        WHEN 'Todo' THEN 2 
-                        WHEN 'Backlog' THEN 3 
-                    END,
-                    CASE priority 
-                        WHEN 'Urgent' THEN 1 
-                        WHEN 'High' THEN 2 
-                        WHEN 'Medium' THEN 3 
-                        WHEN 'Low' THEN 4 
-                    END
-            ''')
+        cursor.execute(f'''
+            SELECT {TASK_COLUMNS}, substr(created_at, 1, 10) AS created_date FROM tasks
+            WHERE status NOT IN ('Done', 'Canceled')
+            ORDER BY status_rank, priority_rank
+        ''')
     
     rows = cursor.fetchall()
-    conn.close()
     return [dict(row) for row in rows]
 
+def get_done_tasks():
+    """Get Done and Canceled tasks, sorted like get_tasks"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {TASK_COLUMNS}, substr(created_at, 1, 10) AS created_date FROM tasks
+        WHERE status IN ('Done', 'Canceled')
+        ORDER BY status_rank, priority_rank
+    ''')
+    return [dict(row) for row in cursor.fetchall()]
+
 def update_task(task_id: int, **kwargs):
-    """Update a task"""
+    """Update a task, returning the updated task or None if it doesn't exist"""
     valid_fields = ['title', 'description', 'status', 'priority', 'project']
     updates = []
     values = []
@@ -125,36 +145,37 @@ def update_task(task_id: int, **kwargs):
             values.append(value)
     
     if not updates:
-        return False
+        return None
     
     updates.append("updated_at = CURRENT_TIMESTAMP")
     values.append(task_id)
     
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(f'''
-        UPDATE tasks SET {', '.join(updates)} WHERE id = ?
-    ''', values)
-    conn.commit()
-    conn.close()
-    return cursor.rowcount > 0
+    with WRITE_LOCK:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            UPDATE tasks SET {', '.join(updates)} WHERE id = ? RETURNING {TASK_COLUMNS}
+        ''', values)
+        row = cursor.fetchone()
+        conn.commit()
+    return dict(row) if row else None
 
 def delete_task(task_id: int):
-    """Delete a task"""
+    """Delete a task, returning the deleted task or None if it doesn't exist"""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-    conn.commit()
-    conn.close()
-    return cursor.rowcount > 0
+    with WRITE_LOCK:
+        cursor = conn.cursor()
+        cursor.execute(f'DELETE FROM tasks WHERE id = ? RETURNING {TASK_COLUMNS}', (task_id,))
+        row = cursor.fetchone()
+        conn.commit()
+    return dict(row) if row else None
 
 def get_task_by_id(task_id: int):
     """Get a single task by ID"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
+    cursor.execute(f'SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?', (task_id,))
     row = cursor.fetchone()
-    conn.close()
     return dict(row) if row else None
 
 def backup_to_json():
@@ -162,9 +183,8 @@ def backup_to_json():
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM tasks')
+    cursor.execute(f'SELECT {TASK_COLUMNS} FROM tasks')
     rows = cursor.fetchall()
-    conn.close()
     
     tasks = [dict(row) for row in rows]
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -180,15 +200,10 @@ def get_stats():
     conn = get_connection()
     cursor = conn.cursor()
     
-    stats = {}
-    for status in ['Backlog', 'Todo', 'In progress', 'Done', 'Canceled']:
-        cursor.execute('SELECT COUNT(*) FROM tasks WHERE status = ?', (status,))
-        stats[status] = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT COUNT(*) FROM tasks')
-    stats['total'] = cursor.fetchone()[0]
-    
-    conn.close()
+    cursor.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status')
+    counts = dict(cursor.fetchall())
+    stats = {status: counts.get(status, 0) for status in STATUSES}
+    stats['total'] = sum(counts.values())
     return stats
 
 # Initialize on import
@@ -2,45 +2,65 @@
 """Task Manager CLI - Main Entry Point"""
 
 import sys
-import os
+import functools
+from collections import defaultdict
 
-# Add scripts directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+HLINE = "─" * 90
+HEADER_ROW = f"{'ID':<4} {'Status':<12} {'Priority':<8} {'Project':<15} {'Title':<40} {'Created':<12}"
+ROW_FORMAT = "{id:<4} {status:<16} {priority:<12} {project:<17} {title:<40} {created:<12}\n".format
+SHORT_HLINE = "─" * 30
+# Fields `task update` can change; only the clearable ones accept an empty string
+UPDATABLE_FIELDS = ('priority', 'status', 'project', 'title', 'description')
+CLEARABLE_FIELDS = frozenset({'project', 'description'})
+# Longer values are cut to this many characters and marked with '..'
+PROJECT_WIDTH = 15
+TITLE_WIDTH = 40
 
-from db import (
-    init_db, add_task, get_tasks, update_task, 
-    delete_task, get_task_by_id, backup_to_json, get_stats
-)
+STATUS_DISPLAY = {
+    'In progress': '🔄 In progress',
+    'Todo': '📋 Todo',
+    'Backlog': '📦 Backlog',
+    'Done': '✅ Done',
+    'Canceled': '❌ Canceled'
+}
+PRIORITY_DISPLAY = {
+    'Urgent': '🔴 Urgent',
+    'High': '🟠 High',
+    'Medium': '🟡 Medium',
+    'Low': '🟢 Low'
+}
+PRIORITY_EMOJI = {'Urgent': '🔴', 'High': '🟠', 'Medium': '🟡', 'Low': '🟢'}
 
-def print_header():
-    """Print task table header"""
-    print("─" * 90)
-    print(f"{'ID':<4} {'Status':<12} {'Priority':<8} {'Project':<15} {'Title':<40} {'Created':<12}")
-    print("─" * 90)
+def render_table(tasks):
+    """Print tasks as a table with a header, in a single write"""
+    rows = [f"{HLINE}\n{HEADER_ROW}\n{HLINE}\n"]
+    for task in tasks:
+        rows.append(ROW_FORMAT(
+            id=task['id'],
+            status=STATUS_DISPLAY.get(task['status'], task['status']),
+            priority=PRIORITY_DISPLAY.get(task['priority'], task['priority']),
+            project=truncate(task['project'], PROJECT_WIDTH),
+            title=truncate(task['title'], TITLE_WIDTH),
+            created=task['created_date'],
+        ))
+    rows.append("\n")
+    sys.stdout.write("".join(rows))
+
+def truncate(text: str, width: int) -> str:
+    """Cut text to width characters, marking the cut with '..'"""
+    return text if len(text) <= width else f"{text[:width]}.."
 
 def format_status(status: str) -> str:
     """Color format for status"""
-    colors = {
-        'In progress': '🔄 In progress',
-        'Todo': '📋 Todo',
-        'Backlog': '📦 Backlog',
-        'Done': '✅ Done',
-        'Canceled': '❌ Canceled'
-    }
-    return colors.get(status, status)
+    return STATUS_DISPLAY.get(status, status)
 
 def format_priority(priority: str) -> str:
     """Color format for priority"""
-    colors = {
-        'Urgent': '🔴 Urgent',
-        'High': '🟠 High',
-        'Medium': '🟡 Medium',
-        'Low': '🟢 Low'
-    }
-    return colors.get(priority, priority)
+    return PRIORITY_DISPLAY.get(priority, priority)
 
 def cmd_add(args):
     """Add a new task"""
+    from db import add_task
     title = args.title
     priority = getattr(args, 'priority', 'Medium')
     status = getattr(args, 'status', 'Backlog')
@@ -52,11 +72,13 @@ def cmd_add(args):
 
 def cmd_list(args):
     """List tasks"""
+    from db import get_tasks, get_stats
     show_done = getattr(args, 'all', False)
     project_filter = getattr(args, 'project', None)
     tg_mode = getattr(args, 'tg', False)
     
-    tasks = get_tasks(status_filter=project_filter, show_done=show_done)
+    tasks = get_tasks(project_filter=project_filter, show_done=show_done)
+    stats = get_stats()
     
     if not tasks:
         if show_done:
@@ -66,8 +88,6 @@ def cmd_list(args):
             print("   Use 'task list --all' to show Done/Canceled tasks")
         return
     
-    stats = get_stats()
-    
     if tg_mode:
         # Telegram-friendly format
         print_telegram_format(tasks, stats, show_done)
@@ -75,124 +95,127 @@ def cmd_list(args):
         # Default table format
         print(f"\n📊 Tasks: {stats['total']} total | 🔄 {stats['In progress']} | 📋 {stats['Todo']} | 📦 {stats['Backlog']} | ✅ {stats['Done']} | ❌ {stats['Canceled']}\n")
         
-        print_header()
-        for task in tasks:
-            status_display = format_status(task['status'])
-            priority_display = format_priority(task['priority'])
-            project = task['project'][:15] + '..' if len(task['project']) > 15 else task['project']
-            title = task['title'][:40] + '..' if len(task['title']) > 40 else task['title']
-            created = task['created_at'][:10]
-            
-            print(f"{task['id']:<4} {status_display:<16} {priority_display:<12} {project:<17} {title:<40} {created:<12}")
-        print()
+        render_table(tasks)
 
 
 def print_telegram_format(tasks, stats, show_done):
     """Print tasks in Telegram-friendly format"""
     # Header with stats
-    msg = "📋 Task List\n\n"
-    msg += f"📊 {stats['total']} total | 🔄{stats['In progress']} 📋{stats['Todo']} 📦{stats['Backlog']} ✅{stats['Done']} ❌{stats['Canceled']}\n"
-    msg += "\n" + "─" * 30 + "\n\n"
+    parts = [
+        "📋 Task List\n\n",
+        f"📊 {stats['total']} total | 🔄{stats['In progress']} 📋{stats['Todo']} 📦{stats['Backlog']} ✅{stats['Done']} ❌{stats['Canceled']}\n",
+        f"\n{SHORT_HLINE}\n\n",
+    ]
     
     # Group by status
-    in_progress = [t for t in tasks if t['status'] == 'In progress']
-    todo = [t for t in tasks if t['status'] == 'Todo']
-    backlog = [t for t in tasks if t['status'] == 'Backlog']
+    by_status = defaultdict(list)
+    for t in tasks:
+        by_status[t['status']].append(t)
+    in_progress = by_status['In progress']
+    todo = by_status['Todo']
+    backlog = by_status['Backlog']
     
     def format_task_line(t):
-        emoji = "🔴" if t['priority'] == 'Urgent' else "🟠" if t['priority'] == 'High' else "🟡"
+        emoji = PRIORITY_EMOJI.get(t['priority'], '🟡')
         proj = f"[{t['project']}] " if t['project'] else ""
         desc = f"\n   📝 {t['description']}" if t['description'] else ""
         return f"{emoji} `{t['id']}` {proj}{t['title']}{desc}\n"
     
     # In Progress
     if in_progress:
-        msg += "🔄 In Progress\n"
-        for t in in_progress:
-            msg += format_task_line(t)
-        msg += "\n"
+        parts.append("🔄 In Progress\n")
+        parts.extend(format_task_line(t) for t in in_progress)
+        parts.append("\n")
     
     # Todo
     if todo:
-        msg += "📋 Todo\n"
-        for t in todo:
-            msg += format_task_line(t)
-        msg += "\n"
+        parts.append("📋 Todo\n")
+        parts.extend(format_task_line(t) for t in todo)
+        parts.append("\n")
     
     # Backlog
     if backlog:
-        msg += "📦 Backlog\n"
-        for t in backlog:
-            msg += format_task_line(t)
+        parts.append("📦 Backlog\n")
+        parts.extend(format_task_line(t) for t in backlog)
     
     # Footer
-    msg += "\n" + "─" * 30 + "\n"
-    msg += "💡 `task done <id>` 完成 | `task todo <id>` 待办"
+    parts.append(f"\n{SHORT_HLINE}\n")
+    parts.append("💡 `task done <id>` 完成 | `task todo <id>` 待办\n")
     
-    print(msg)
+    # Emit UTF-8 regardless of locale; fall back for text-only streams
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        sys.stdout.write("".join(parts))
+    else:
+        sys.stdout.flush()
+        buffer.write("".join(parts).encode('utf-8'))
 
 def cmd_done(args):
     """Mark task as done"""
+    from db import update_task
     task_id = args.id
-    task = get_task_by_id(task_id)
+    task = update_task(task_id, status='Done')
     if not task:
         print(f"❌ Task #{task_id} not found")
         return
     
-    update_task(task_id, status='Done')
     print(f"✅ Task #{task_id} marked as Done: {task['title']}")
 
 def cmd_cancel(args):
     """Cancel a task"""
+    from db import update_task
     task_id = args.id
-    task = get_task_by_id(task_id)
+    task = update_task(task_id, status='Canceled')
     if not task:
         print(f"❌ Task #{task_id} not found")
         return
     
-    update_task(task_id, status='Canceled')
     print(f"❌ Task #{task_id} canceled: {task['title']}")
 
 def cmd_todo(args):
     """Move task to Todo"""
+    from db import update_task
     task_id = args.id
-    task = get_task_by_id(task_id)
+    task = update_task(task_id, status='Todo')
     if not task:
         print(f"❌ Task #{task_id} not found")
         return
     
-    update_task(task_id, status='Todo')
     print(f"📋 Task #{task_id} moved to Todo: {task['title']}")
 
 def cmd_update(args):
     """Update task fields"""
+    from db import get_task_by_id, update_task
     task_id = args.id
-    task = get_task_by_id(task_id)
-    if not task:
-        print(f"❌ Task #{task_id} not found")
-        return
     
-    updates = {}
-    if hasattr(args, 'priority') and args.priority:
-        updates['priority'] = args.priority
-    if hasattr(args, 'status') and args.status:
-        updates['status'] = args.status
-    if hasattr(args, 'project') and args.project is not None:
-        updates['project'] = args.project
-    if hasattr(args, 'title') and args.title:
-        updates['title'] = args.title
-    if hasattr(args, 'description') and args.description is not None:
-        updates['description'] = args.description
+    updates = {
+        field: value for field in UPDATABLE_FIELDS
+        if (value := getattr(args, field, None)) is not None and (value or field in CLEARABLE_FIELDS)
+    }
     
     if updates:
-        update_task(task_id, **updates)
+        task = update_task(task_id, **updates)
+    else:
+        task = get_task_by_id(task_id)
+    if not task:
+        print(f"❌ Task #{task_id} not found")
+    elif updates:
         print(f"✅ Task #{task_id} updated")
     else:
         print("ℹ️  No updates provided")
 
 def cmd_delete(args):
     """Delete a task"""
+    from db import get_task_by_id, delete_task
     task_id = args.id
+    if getattr(args, 'yes', False):
+        task = delete_task(task_id)
+        if task:
+            print(f"✅ Task #{task_id} deleted: {task['title']}")
+        else:
+            print(f"❌ Task #{task_id} not found")
+        return
+    
     task = get_task_by_id(task_id)
     if not task:
         print(f"❌ Task #{task_id} not found")
@@ -207,45 +230,55 @@ def cmd_delete(args):
 
 def cmd_backup(args):
     """Backup database to JSON"""
+    from db import backup_to_json
     backup_path = backup_to_json()
     print(f"💾 Backup saved to: {backup_path}")
 
 def cmd_stats(args):
     """Show task statistics"""
+    from db import get_stats
     stats = get_stats()
-    print("\n📊 Task Statistics")
-    print("─" * 30)
-    print(f"  In progress: {stats['In progress']}")
-    print(f"  Todo:       {stats['Todo']}")
-    print(f"  Backlog:    {stats['Backlog']}")
-    print(f"  Done:       {stats['Done']}")
-    print(f"  Canceled:   {stats['Canceled']}")
-    print(f"  ─────────────────")
-    print(f"  Total:      {stats['total']}")
-    print()
+    sys.stdout.write(
+        "\n📊 Task Statistics\n"
+        f"{SHORT_HLINE}\n"
+        f"  In progress: {stats['In progress']}\n"
+        f"  Todo:       {stats['Todo']}\n"
+        f"  Backlog:    {stats['Backlog']}\n"
+        f"  Done:       {stats['Done']}\n"
+        f"  Canceled:   {stats['Canceled']}\n"
+        "  ─────────────────\n"
+        f"  Total:      {stats['total']}\n"
+        "\n"
+    )
 
 def cmd_show_done(args):
     """Show only Done and Canceled tasks"""
-    tasks = get_tasks(show_done=True)
-    done_tasks = [t for t in tasks if t['status'] in ('Done', 'Canceled')]
+    from db import get_done_tasks
+    done_tasks = get_done_tasks()
     
     if not done_tasks:
         print("📭 No Done/Canceled tasks")
         return
     
-    print_header()
-    for task in done_tasks:
-        status_display = format_status(task['status'])
-        priority_display = format_priority(task['priority'])
-        project = task['project'][:15] + '..' if len(task['project']) > 15 else task['project']
-        title = task['title'][:40] + '..' if len(task['title']) > 40 else task['title']
-        created = task['created_at'][:10]
-        
-        print(f"{task['id']:<4} {status_display:<16} {priority_display:<12} {project:<17} {title:<40} {created:<12}")
-    print()
+    render_table(done_tasks)
 
-def main():
-    """Main entry point"""
+# Subcommand name -> handler
+COMMANDS = {
+    'add': cmd_add,
+    'list': cmd_list,
+    'done': cmd_done,
+    'cancel': cmd_cancel,
+    'todo': cmd_todo,
+    'update': cmd_update,
+    'delete': cmd_delete,
+    'show-done': cmd_show_done,
+    'stats': cmd_stats,
+    'backup': cmd_backup,
+}
+
+@functools.cache
+def build_parser():
+    """Build the CLI argument parser once per process"""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -264,6 +297,7 @@ Examples:
   task todo 1                                      # Move to Todo
   task update 1 --priority high                    # Update priority
   task delete 1                                   # Delete task #1
+  task delete 1 --yes                             # Delete without confirmation
   task show-done                                  # Show only Done/Canceled
   task stats                                      # Show statistics
   task backup                                     # Backup to JSON
@@ -309,6 +343,7 @@ Examples:
     # delete
     p_delete = subparsers.add_parser('delete', help='Delete a task')
     p_delete.add_argument('id', type=int, help='Task ID')
+    p_delete.add_argument('--yes', '-y', action='store_true', help='Delete without asking for confirmation')
     
     # show-done
     subparsers.add_parser('show-done', help='Show Done/Canceled tasks only')
@@ -319,27 +354,19 @@ Examples:
     # backup
     subparsers.add_parser('backup', help='Backup database to JSON')
     
-    args = parser.parse_args()
-    
-    # Initialize database
-    init_db()
+    return parser
+
+def main(argv=None):
+    """Main entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
     # Route command
-    commands = {
-        'add': cmd_add,
-        'list': cmd_list,
-        'done': cmd_done,
-        'cancel': cmd_cancel,
-        'todo': cmd_todo,
-        'update': cmd_update,
-        'delete': cmd_delete,
-        'show-done': cmd_show_done,
-        'stats': cmd_stats,
-        'backup': cmd_backup,
-    }
-    
-    if args.command in commands:
-        commands[args.command](args)
+    if args.command in COMMANDS:
+        # Initialize database (imported here so help and usage paths skip it)
+        from db import init_db
+        init_db()
+        COMMANDS[args.command](args)
     else:
         parser.print_help()
 